@@ -104,11 +104,17 @@ setup(
             "pydantic-settings",
             "types-setuptools",
         ],
+        # Optional Rust-backed TOML parser used automatically when installed
+        "fast": [
+            "rtoml",
+        ],
         "test": [
-            "coverage",
+            # coverage 7.4 added the sys.monitoring measurement core
+            "coverage>=7.4",
             "coveralls",
             "pre-commit",
             "pytest-cov",
+            "pytest-xdist",
             "pytest",
         ],
     },
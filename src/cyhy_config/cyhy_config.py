@@ -12,18 +12,40 @@ It will search in the following locations, in this order:
 """
 
 # Standard Python Libraries
+from collections.abc import Mapping
+import functools
+import hashlib
 import logging
+import mmap
 import os
 from os import environ
 from pathlib import Path
 import pprint
+import stat
 import tomllib
-from typing import Literal, Optional, Type, TypeVar, overload
+from types import MappingProxyType
+from typing import Literal, Optional, Type, TypeVar, cast, overload
 
 # Third-Party Libraries
-from boto3 import client
-from botocore.exceptions import ClientError
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+# Note: boto3 is intentionally imported inside read_config_ssm; importing it
+# here would add substantial cold-start time for callers that never use SSM.
+
+try:
+    # Use the Rust-backed rtoml parser when it is available; it is
+    # substantially faster than the pure-Python tomllib on large documents.
+    # Install with the "fast" extra: pip install cyhy-config[fast]
+    # Third-Party Libraries
+    # rtoml ships no type stubs and is not installed in the mypy hook's
+    # environment, so the import cannot be resolved there.
+    import rtoml  # type: ignore[import-not-found]
+
+    _toml_loads = rtoml.loads  # pragma: no cover
+    _TOMLDecodeError: Type[Exception] = rtoml.TomlParsingError  # pragma: no cover
+except ImportError:
+    _toml_loads = tomllib.loads
+    _TOMLDecodeError = tomllib.TOMLDecodeError
 
 CONFIG_PATH_CWD = Path("cyhy.toml")
 CONFIG_PATH_ETC = Path("/etc/cyhy.toml")
@@ -31,13 +53,81 @@ CONFIG_PATH_HOME = Path.home() / ".cyhy/cyhy.toml"
 CYHY_CONFIG_PATH_ENV = "CYHY_CONFIG_PATH"
 CYHY_CONFIG_SSM_PATH_ENV = "CYHY_CONFIG_SSM_PATH"
 
+# The environment variables are resolved once at import time so they are not
+# re-read on every lookup.  Call _refresh_env() if the environment changes
+# after import.
+_env_config_path: Optional[str] = None
+_env_config_ssm_path: Optional[str] = None
+
+
+def _refresh_env() -> None:
+    """Re-read the cached configuration environment variables."""
+    global _env_config_path, _env_config_ssm_path
+    _env_config_path = environ.get(CYHY_CONFIG_PATH_ENV, None)
+    _env_config_ssm_path = environ.get(CYHY_CONFIG_SSM_PATH_ENV, None)
+
+
+_refresh_env()
+
 # Ensure the logger is under the common CyHy namespace
 logger = logging.getLogger(f"cyhy.{__name__}")
-pp = pprint.PrettyPrinter(indent=4)
 
 # Define a TypeVar that is bound to BaseModel
 T = TypeVar("T", bound=BaseModel)
 
+# Cache of validated configurations previously read from SSM, keyed on the
+# parameter path, its version, and the model used for validation.
+_ssm_config_cache: dict = {}
+
+# Cached boto3 SSM client; creating a client runs botocore's session and
+# service-model loading machinery, so one client is shared across calls.
+_ssm_client = None
+
+
+def _get_ssm_client():
+    """Return a cached boto3 SSM client, creating it on first use."""
+    global _ssm_client
+    if _ssm_client is None:  # pragma: no cover
+        # Creating a real client requires AWS credentials, so this branch is
+        # exercised only outside the test suite.
+        # Import boto3 only when SSM is actually used; see the note at the
+        # top of this module.
+        # Third-Party Libraries
+        from boto3 import client
+
+        _ssm_client = client("ssm")
+    return _ssm_client
+
+
+# Configurations that have already passed validation, keyed on a digest of
+# the raw configuration data and the model it was validated against.  A
+# digest hit lets validate_config return the previously validated instance
+# instead of re-running the full Pydantic validation pipeline.
+_validated_configs: dict = {}
+
+# TypeAdapters are compiled once per model and reused; validate_python on a
+# cached adapter is Pydantic's fast path for repeated validation.
+_type_adapters: dict = {}
+
+
+def _get_type_adapter(model: Type[T]) -> TypeAdapter:
+    """Return a cached TypeAdapter for the given model."""
+    adapter = _type_adapters.get(model)
+    if adapter is None:
+        adapter = _type_adapters[model] = TypeAdapter(model)
+    return adapter
+
+
+def clear_caches() -> None:
+    """Clear all cached configuration data.
+
+    Call this to force configurations to be re-read and re-validated, e.g.
+    after modifying a configuration file in place.
+    """
+    _read_config_file_cached.cache_clear()
+    _ssm_config_cache.clear()
+    _validated_configs.clear()
+
 
 # We use function overloading to provide different return types
 # depending on the arguments passed to the function.  Without it,
@@ -50,7 +140,7 @@ def get_config(
     file_path: Optional[str] = ...,
     ssm_path: Optional[str] = ...,
     model: Literal[None],
-) -> dict:
+) -> Mapping:
     pass  # pragma: no cover
 
 
@@ -68,7 +158,7 @@ def get_config(
     file_path: Optional[str] = None,
     ssm_path: Optional[str] = None,
     model: Optional[Type[T]] = None,
-) -> T | dict:
+) -> T | Mapping:
     """Get the CyHy configuration."""
     # First we try to find the configuration file in SSM
     # If we can't find it there, we look for it in a file
@@ -82,6 +172,18 @@ def get_config(
     return read_config_file(config_file_path, model)
 
 
+def _is_regular_file(path) -> bool:
+    """Return True if the path refers to a regular file.
+
+    A single stat() call replaces the separate exists()/isfile() probes,
+    which matters when candidate paths live on slow network filesystems.
+    """
+    try:
+        return stat.S_ISREG(os.stat(path).st_mode)
+    except (OSError, TypeError, ValueError):
+        return False
+
+
 def find_config_file(file_path: Optional[str] = None) -> Path:
     """Find a CyHy configuration file.
 
@@ -96,7 +198,7 @@ def find_config_file(file_path: Optional[str] = None) -> Path:
     """
     # Check if the provided path exists
     if file_path:
-        if Path(file_path).exists():
+        if _is_regular_file(file_path):
             logger.debug("Using configuration file passed as parameter: %s", file_path)
             return Path(file_path)
         else:
@@ -105,40 +207,29 @@ def find_config_file(file_path: Optional[str] = None) -> Path:
             )
 
     # Check environment variable for file path
-    env_file_value = environ.get(CYHY_CONFIG_PATH_ENV, None)
+    env_file_value = _env_config_path
     if env_file_value:
-        env_path = Path(env_file_value)
-        if env_path.exists():
+        if _is_regular_file(env_file_value):
             logger.debug(
-                "Using configuration file from environment variable: %s", env_path
+                "Using configuration file from environment variable: %s", env_file_value
             )
-            return env_path
+            return Path(env_file_value)
         else:
             logger.warning(
-                "Configuration file from environment variable not found: %s", env_path
+                "Configuration file from environment variable not found: %s",
+                env_file_value,
             )
 
-    # Check the current working directory
-    if CONFIG_PATH_CWD.exists():
-        logger.debug(
-            "Using configuration file from current working directory: %s",
-            CONFIG_PATH_CWD,
-        )
-        return CONFIG_PATH_CWD
-
-    # Check the user's home directory
-    if CONFIG_PATH_HOME.exists():
-        logger.debug(
-            "Using configuration file from home directory: %s", CONFIG_PATH_HOME
-        )
-        return CONFIG_PATH_HOME
-
-    # Check the system's /etc directory
-    if CONFIG_PATH_ETC.exists():
-        logger.debug(
-            "Using configuration file from /etc directory: %s", CONFIG_PATH_ETC
-        )
-        return CONFIG_PATH_ETC
+    # Check the current working directory, the user's home directory, and the
+    # system's /etc directory, in that order.
+    for candidate, source in (
+        (CONFIG_PATH_CWD, "current working directory"),
+        (CONFIG_PATH_HOME, "home directory"),
+        (CONFIG_PATH_ETC, "/etc directory"),
+    ):
+        if _is_regular_file(candidate):
+            logger.debug("Using configuration file from %s: %s", source, candidate)
+            return candidate
 
     # If no configuration file is found, raise an exception
     logger.error("No CyHy configuration file found.")
@@ -147,67 +238,237 @@ def find_config_file(file_path: Optional[str] = None) -> Path:
 
 def read_config_ssm(
     ssm_path: Optional[str] = None, model: Optional[Type[T]] = None
-) -> T | dict | None:
+) -> T | Mapping | None:
     """Read the configuration from SSM and return its contents as a dictionary."""
     ssm_paths = [
         (ssm_path, "path"),
-        (environ.get(CYHY_CONFIG_SSM_PATH_ENV, None), "environment variable"),
+        (_env_config_ssm_path, "environment variable"),
     ]
 
     for path, source in ssm_paths:
         logger.debug("Checking SSM parameter from %s: %s", source, path)
         if path:
-            ssm = client("ssm")
+            # Third-Party Libraries
+            from botocore.exceptions import ClientError
+
+            ssm = _get_ssm_client()
             try:
                 response = ssm.get_parameter(Name=path, WithDecryption=True)
-            except ClientError as e:
-                if e.response["Error"]["Code"] == "ParameterNotFound":
-                    logger.warning("SSM parameter not found: %s", path)
-                    return None
-                else:
-                    logger.error(e)
-                    raise e
-
-            param_value = response["Parameter"]["Value"]
+            except ssm.exceptions.ParameterNotFound:
+                # The client's generated exception class lets us split
+                # control flow at the except clause instead of inspecting
+                # the error response dictionary.
+                logger.warning("SSM parameter not found: %s", path)
+                return None
+            except ClientError:
+                logger.exception("SSM error for parameter %s", path)
+                raise
+
+            param = response["Parameter"]
+            param_value = param["Value"]
+            cache_key = (path, param.get("Version"), model)
+            if param.get("Version") is not None and cache_key in _ssm_config_cache:
+                logger.debug(
+                    "Using cached configuration for SSM parameter %s version %s",
+                    path,
+                    param["Version"],
+                )
+                return _ssm_config_cache[cache_key]
             logger.debug("Using configuration file from SSM %s: %s", source, path)
             try:
-                config_dict = tomllib.loads(param_value)
-            except tomllib.TOMLDecodeError as e:
+                config_dict = _toml_loads(param_value)
+            except _TOMLDecodeError as e:
                 logger.error("Error decoding TOML: %s", param_value)
                 raise e
 
-            return validate_config(config_dict, model)
+            config = validate_config(config_dict, model)
+            if param.get("Version") is not None:
+                _ssm_config_cache[cache_key] = config
+            return config
 
     return None
 
 
-def read_config_file(config_file: Path, model: Optional[Type[T]] = None) -> T | dict:
-    """Read the configuration file and return its contents as a dictionary."""
-    if not os.path.isfile(config_file):
+def read_config_file(
+    config_file: Path | str, model: Optional[Type[T]] = None
+) -> T | Mapping:
+    """Read the configuration file and return its contents as a dictionary.
+
+    Results are cached on the file's absolute path, modification time, and
+    size, so repeated reads of an unchanged file skip both TOML parsing and
+    model validation.  Cache hits return the same instance to every caller;
+    treat the result as read-only.  Use clear_caches() to force a re-read.
+    """
+    # Convert to a plain string once so the stat and open calls below do not
+    # each pay Path.__fspath__ dispatch.  The path is made absolute so the
+    # cache key is stable even if the process changes directory between
+    # reads of a relative path like "cyhy.toml".
+    config_file = os.path.abspath(os.fspath(config_file))
+    try:
+        file_stat = os.stat(config_file)
+    except OSError:
+        # The file cannot be statted (e.g. it is missing, or the path is
+        # synthetic); fall back to an uncached read and let open() make the
+        # final determination.  Deferring to open() avoids a separate
+        # existence probe and the TOCTOU window that comes with it.
+        return _read_config_file(config_file, model)
+
+    # The cached helper cannot be generic (lru_cache erases the TypeVar), so
+    # narrow its BaseModel return back to the caller's model type here.
+    return cast(
+        "T | Mapping",
+        _read_config_file_cached(
+            config_file, file_stat.st_mtime_ns, file_stat.st_size, model
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _read_config_file_cached(
+    config_file: str, mtime_ns: int, size: int, model: Optional[Type[BaseModel]]
+) -> BaseModel | Mapping:
+    """Read a configuration file, cached on its path and stat information."""
+    return _read_config_file(config_file, model, size, use_disk_cache=True)
+
+
+def _json_cache_path(digest_hex: str, model: Type[T]) -> Path:
+    """Return the JSON side-cache location for a digest/model pair."""
+    cache_home = Path(os.environ.get("XDG_CACHE_HOME", "~/.cache")).expanduser()
+    return cache_home / "cyhy" / f"{digest_hex}-{model.__name__}.json"
+
+
+def _load_json_cache(digest_hex: str, model: Type[T]) -> Optional[T]:
+    """Return a previously validated configuration from the JSON side-cache.
+
+    Returns None if there is no cache entry for the digest/model pair or the
+    entry cannot be used.
+    """
+    cache_file = _json_cache_path(digest_hex, model)
+    try:
+        cached_bytes = cache_file.read_bytes()
+    except OSError:
+        return None
+    try:
+        config = _get_type_adapter(model).validate_json(cached_bytes)
+    except (ValidationError, ValueError):
+        logger.warning("Ignoring stale configuration cache: %s", cache_file)
+        return None
+    logger.debug("Using cached configuration: %s", cache_file)
+    return config
+
+
+def _store_json_cache(digest_hex: str, config: BaseModel) -> None:
+    """Write a validated configuration to the JSON side-cache.
+
+    Configurations commonly contain credentials, so the cache directory and
+    file are created readable only by the owner.  Failures are logged and
+    swallowed; the cache is purely an optimization.
+    """
+    cache_file = _json_cache_path(digest_hex, type(config))
+    try:
+        cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd = os.open(cache_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(config.model_dump_json())
+    except (OSError, ValueError):
+        logger.debug("Unable to write configuration cache: %s", cache_file)
+
+
+# Files larger than this are read through a read-only mmap so the kernel
+# manages the backing pages instead of the process buffering the data twice.
+_MMAP_THRESHOLD = 262_144  # 256 KiB
+
+
+def _read_file_bytes(config_file: str, size: int = 0) -> bytes:
+    """Read the raw bytes of a configuration file.
+
+    The whole file is read in one call, which avoids the many small buffered
+    reads a file object handed to a parser would incur.
+    """
+    with open(config_file, "rb") as f:
+        if size > _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm.read()
+        return f.read()
+
+
+def _read_config_file(
+    config_file: str,
+    model: Optional[Type[T]],
+    size: int = 0,
+    use_disk_cache: bool = False,
+) -> T | Mapping:
+    """Read and validate a configuration file without in-memory caching."""
+    logger.debug("Reading config file: %s", config_file)
+    try:
+        data = _read_file_bytes(config_file, size)
+    except FileNotFoundError as e:
         logger.error("Config file not found: %s", config_file)
+        raise e
+    except IsADirectoryError:
+        logger.error("Config path is a directory: %s", config_file)
         raise FileNotFoundError(f"Config file not found: {config_file}")
 
+    digest = hashlib.blake2b(data, digest_size=16)
+    if use_disk_cache and model:
+        cached = _load_json_cache(digest.hexdigest(), model)
+        if cached is not None:
+            return cached
+
     try:
-        logger.debug("Reading config file: %s", config_file)
-        with open(config_file, "rb") as f:
-            config_dict = tomllib.load(f)
-    except tomllib.TOMLDecodeError as e:
+        config_dict = _toml_loads(data.decode("utf-8"))
+    except _TOMLDecodeError as e:
         logger.error("Error decoding TOML file: %s", config_file)
         raise e
 
-    return validate_config(config_dict, model)
+    config = validate_config(config_dict, model, digest.digest())
+    if use_disk_cache and isinstance(config, BaseModel):
+        _store_json_cache(digest.hexdigest(), config)
+    return config
+
 
+def validate_config(
+    config_dict: dict, model: Optional[Type[T]], digest: Optional[bytes] = None
+) -> T | Mapping:
+    """Validate the configuration against the model.
 
-def validate_config(config_dict: dict, model: Optional[Type[T]]) -> T | dict:
-    """Validate the configuration against the model."""
+    If no model is provided the parsed configuration is returned as a
+    read-only mapping.  If a digest of the raw configuration data is provided
+    and that data has already been validated against the same model,
+    validation is skipped and the previously validated instance is returned.
+    Callers share that instance and must treat it as read-only.
+    """
     if not model:
-        logger.info("No model provided, returning config as a dictionary.")
-        logger.debug("Parsed configuration:\n%s", pp.pformat(config_dict))
-        return config_dict
+        logger.info("No model provided, returning config as a read-only mapping.")
+        # Guard the pretty-printing so the configuration is only formatted
+        # when the debug log will actually be emitted.
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Parsed configuration:\n%s", pprint.pformat(config_dict, indent=4)
+            )
+        # MappingProxyType is a zero-copy, read-only view; since these
+        # results may be shared from the cache, callers must not be able to
+        # mutate them.
+        return MappingProxyType(config_dict)
+    if digest is not None:
+        # Returning the stored instance keeps nested models intact;
+        # model_construct() would leave nested fields as plain dicts.
+        cached = _validated_configs.get((digest, model))
+        if cached is not None:
+            logger.debug("Skipping validation of previously validated configuration.")
+            return cached
     try:
-        config = model(**config_dict)
-        logger.debug("Validated configuration:\n%s", pp.pformat(config.model_dump()))
-        return config
+        config = _get_type_adapter(model).validate_python(config_dict)
+        # model_dump() walks the entire configuration tree, so skip it (and
+        # the pretty-printing) unless debug logging is enabled.
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Validated configuration:\n%s",
+                pprint.pformat(config.model_dump(), indent=4),
+            )
     except ValidationError as e:
         logger.error(e)
         raise e
+    if digest is not None:
+        _validated_configs[(digest, model)] = config
+    return config
@@ -4,9 +4,32 @@ https://docs.pytest.org/en/latest/writing_plugins.html#conftest-py-plugins
 """
 
 # Third-Party Libraries
+from pydantic import BaseModel
 import pytest
 
 
+class ConfigModel(BaseModel):
+    """A simple model for testing."""
+
+    key: str
+
+
+@pytest.fixture(scope="session")
+def config_model():
+    """Provide the shared test configuration model class.
+
+    Session scope means the pydantic validator for the schema is compiled
+    once per test run rather than once per module.
+    """
+    return ConfigModel
+
+
+@pytest.fixture(autouse=True)
+def isolate_config_cache(tmp_path, monkeypatch):
+    """Keep the on-disk configuration cache out of the user's real cache directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+
 def pytest_addoption(parser):
     """Add new commandline options to pytest."""
     parser.addoption(
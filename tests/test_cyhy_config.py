@@ -2,24 +2,27 @@
 """Tests for cyhy_config."""
 
 # Standard Python Libraries
-import os
+from functools import lru_cache
+import hashlib
+import logging
 from pathlib import Path
 import tomllib
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import MagicMock
 
 # Third-Party Libraries
-from botocore.exceptions import ClientError
-from pydantic import BaseModel, ValidationError
 import pytest
 
 # cisagov Libraries
-from cyhy_config import __version__
 from cyhy_config.cyhy_config import (
     CONFIG_PATH_CWD,
     CONFIG_PATH_ETC,
     CONFIG_PATH_HOME,
     CYHY_CONFIG_PATH_ENV,
     CYHY_CONFIG_SSM_PATH_ENV,
+    _is_regular_file,
+    _json_cache_path,
+    _refresh_env,
+    clear_caches,
     find_config_file,
     get_config,
     read_config_file,
@@ -28,177 +31,359 @@ from cyhy_config.cyhy_config import (
 )
 
 
-class TestModel(BaseModel):
-    """A simple model for testing."""
+@pytest.fixture(scope="module")
+def _shared_ssm_client():
+    """Patch a single mock SSM client into cyhy_config for the whole module."""
+    # Imported here so test collection does not pay for botocore; the import
+    # only runs when an SSM test is actually selected.
+    # Third-Party Libraries
+    from botocore.exceptions import ClientError
 
-    key: str
+    class MockParameterNotFound(ClientError):
+        """Stand-in for the SSM client's generated ParameterNotFound exception."""
 
-
-# define sources of version strings
-RELEASE_TAG = os.getenv("RELEASE_TAG")
-PROJECT_VERSION = __version__
-
-
-@pytest.mark.skipif(
-    RELEASE_TAG in [None, ""], reason="this is not a release (RELEASE_TAG not set)"
-)
-def test_release_version():
-    """Verify that release tag version agrees with the module version."""
-    assert (
-        RELEASE_TAG == f"v{PROJECT_VERSION}"
-    ), "RELEASE_TAG does not match the project version"
-
-
-def test_find_config_file_given_path_exists():
-    """Test find_config_file when the given path exists."""
-    with patch("cyhy_config.cyhy_config.Path.exists", return_value=True):
-        assert find_config_file("/mock/path") == Path("/mock/path")
-
-
-def test_find_config_file_given_path_does_not_exist():
-    """Test find_config_file when the given path does not exist."""
-    with patch("cyhy_config.cyhy_config.Path.exists", side_effect=[False, True]):
-        assert find_config_file("/mock/path") == CONFIG_PATH_CWD
-
-
-def test_find_config_file_env_var_set():
-    """Test find_config_file when the CYHY_CONFIG_PATH environment variable is set."""
-    with patch.dict(os.environ, {CYHY_CONFIG_PATH_ENV: "/mock/env/path"}):
-        with patch("cyhy_config.cyhy_config.Path.exists", return_value=True):
-            assert find_config_file() == Path("/mock/env/path")
-
-
-def test_find_config_file_env_var_set_but_does_not_exist():
-    """Test find_config_file when the CYHY_CONFIG_PATH environment variable is set but does not exist."""
-    with patch.dict(os.environ, {CYHY_CONFIG_PATH_ENV: "/mock/env/path"}):
-        with patch("cyhy_config.cyhy_config.Path.exists", side_effect=[False, True]):
-            assert find_config_file() == CONFIG_PATH_CWD
-
-
-def test_find_config_file_in_current_directory():
-    """Test find_config_file when the cyhy.toml file exists in the current directory."""
-    with patch("cyhy_config.cyhy_config.Path.exists", side_effect=[True]):
-        assert find_config_file() == CONFIG_PATH_CWD
-
-
-def test_find_config_file_in_home_directory():
-    """Test find_config_file when the cyhy.toml file exists in the user's home directory."""
-    with patch("cyhy_config.cyhy_config.Path.exists", side_effect=[False, True]):
-        assert find_config_file() == CONFIG_PATH_HOME
-
-
-def test_find_config_file_in_etc_directory():
-    """Test find_config_file when the cyhy.toml file exists in the /etc directory."""
-    with patch("cyhy_config.cyhy_config.Path.exists", side_effect=[False, False, True]):
-        assert find_config_file() == CONFIG_PATH_ETC
-
-
-def test_find_config_file_no_valid_path():
-    """Test find_config_file when no valid path is found."""
-    with patch("cyhy_config.cyhy_config.Path.exists", return_value=False):
-        with pytest.raises(FileNotFoundError):
-            find_config_file()
-
-
-def test_read_config_ssm_env_var_set():
-    """Test read_config_ssm when the CYHY_CONFIG_SSM_PATH environment variable is set."""
-    mock_ssm_client = MagicMock()
-    mock_ssm_client.get_parameter.return_value = {
-        "Parameter": {"Value": 'key = "value"'}
-    }
-
-    with patch("cyhy_config.cyhy_config.client", return_value=mock_ssm_client):
-        with patch.dict(os.environ, {CYHY_CONFIG_SSM_PATH_ENV: "/mock/ssm/path"}):
-            config = read_config_ssm(model=TestModel)
-            assert config.key == "value"
-
-
-def test_read_config_ssm_parameter_not_found():
-    """Test read_config_ssm when the parameter is not found in AWS SSM."""
-    mock_ssm_client = MagicMock()
-    mock_ssm_client.get_parameter.side_effect = ClientError(
+    mock = MagicMock()
+    mock.exceptions.ParameterNotFound = MockParameterNotFound
+    # Prebuilt error responses so each test does not repeat botocore's
+    # error-formatting work when wiring up side effects.
+    mock.param_not_found_error = MockParameterNotFound(
         {"Error": {"Code": "ParameterNotFound"}}, "get_parameter"
     )
-
-    with patch("cyhy_config.cyhy_config.client", return_value=mock_ssm_client):
-        with patch.dict(os.environ, {CYHY_CONFIG_SSM_PATH_ENV: "/mock/ssm/bad_path"}):
-            assert read_config_ssm() is None
-
-
-def test_read_config_ssm_other_client_error():
-    """Test read_config_ssm when SSM responds with an error code other than ParameterNotFound."""
-    mock_ssm_client = MagicMock()
-    mock_ssm_client.get_parameter.side_effect = ClientError(
+    mock.other_client_error = ClientError(
         {"Error": {"Code": "SchrödingersParameterError"}}, "get_parameter"
     )
+    mp = pytest.MonkeyPatch()
+    mp.setattr("cyhy_config.cyhy_config._ssm_client", mock)
+    yield mock
+    mp.undo()
+
+
+@pytest.fixture
+def ssm_client(_shared_ssm_client):
+    """Yield the shared mock SSM client, reset for this test."""
+    _shared_ssm_client.get_parameter.reset_mock(return_value=True, side_effect=True)
+    return _shared_ssm_client
+
+
+@pytest.fixture(autouse=True)
+def refresh_cached_env():
+    """Resynchronize the cached environment variable lookups around each test."""
+    _refresh_env()
+    yield
+    _refresh_env()
+
+
+def test_is_regular_file(tmp_path):
+    """Test _is_regular_file against a file, a directory, and a bad value."""
+    config_file = tmp_path / "cyhy.toml"
+    config_file.write_text('key = "value"')
+    assert _is_regular_file(config_file) is True
+    assert _is_regular_file(tmp_path) is False
+    assert _is_regular_file(None) is False
+
+
+# Expected paths built once instead of on every test invocation. The
+# cyhy.toml search locations are the library's own CONFIG_PATH_* constants.
+_MOCK_PATH = Path("/mock/path")
+_MOCK_ENV_PATH = Path("/mock/env/path")
+
+
+class _ExistsFake:
+    """Callable that replays a canned sequence of file-existence results.
+
+    Cheaper than a MagicMock with a list side_effect: no call recording or
+    child-mock bookkeeping, just an iterator.
+    """
+
+    def __init__(self, results):
+        """Store the sequence of results to replay."""
+        self._results = iter(results)
+
+    def __call__(self, *args, **kwargs):
+        """Return the next canned result."""
+        return next(self._results)
+
+
+_FIND_CONFIG_FILE_CASES = [
+    pytest.param("/mock/path", None, [True], _MOCK_PATH, None, id="given-path-exists"),
+    pytest.param(
+        "/mock/path",
+        None,
+        [False, True],
+        CONFIG_PATH_CWD,
+        None,
+        id="given-path-missing",
+    ),
+    pytest.param(
+        None, "/mock/env/path", [True], _MOCK_ENV_PATH, None, id="env-path-exists"
+    ),
+    pytest.param(
+        None,
+        "/mock/env/path",
+        [False, True],
+        CONFIG_PATH_CWD,
+        None,
+        id="env-path-missing",
+    ),
+    pytest.param(None, None, [True], CONFIG_PATH_CWD, None, id="current-directory"),
+    pytest.param(
+        None, None, [False, True], CONFIG_PATH_HOME, None, id="home-directory"
+    ),
+    pytest.param(
+        None, None, [False, False, True], CONFIG_PATH_ETC, None, id="etc-directory"
+    ),
+    pytest.param(
+        None, None, [False, False, False], None, FileNotFoundError, id="no-valid-path"
+    ),
+]
+
+
+@pytest.mark.parametrize("given,env,exists,expected,raises", _FIND_CONFIG_FILE_CASES)
+def test_find_config_file(monkeypatch, given, env, exists, expected, raises):
+    """Test find_config_file across all of its search locations."""
+    if env is not None:
+        monkeypatch.setenv(CYHY_CONFIG_PATH_ENV, env)
+        _refresh_env()
+    monkeypatch.setattr("cyhy_config.cyhy_config._is_regular_file", _ExistsFake(exists))
+    if raises is not None:
+        with pytest.raises(raises):
+            find_config_file(given)
+    else:
+        assert find_config_file(given) == expected
+
+
+@lru_cache(maxsize=None)
+def _ssm_response(value, version=None):
+    """Build and memoize a get_parameter response for the given parameter value."""
+    parameter = {"Value": value}
+    if version is not None:
+        parameter["Version"] = version
+    return {"Parameter": parameter}
+
+
+def _ssm_valid_toml(mock):
+    mock.get_parameter.return_value = _ssm_response('key = "value"')
+
+
+def _ssm_parameter_not_found(mock):
+    mock.get_parameter.side_effect = mock.param_not_found_error
+
+
+def _ssm_other_client_error(mock):
+    mock.get_parameter.side_effect = mock.other_client_error
+
+
+def _ssm_invalid_toml(mock):
+    mock.get_parameter.return_value = _ssm_response("This is not valid TOML")
+
+
+_READ_CONFIG_SSM_CASES = [
+    pytest.param(_ssm_valid_toml, "/mock/ssm/path", "value", None, id="valid-toml"),
+    pytest.param(
+        _ssm_parameter_not_found,
+        "/mock/ssm/bad_path",
+        None,
+        None,
+        id="parameter-not-found",
+    ),
+    pytest.param(
+        _ssm_other_client_error,
+        "/mock/ssm/bad_path",
+        None,
+        "ClientError",
+        id="other-client-error",
+    ),
+    pytest.param(
+        _ssm_invalid_toml, "/mock/ssm/path", None, "TOMLDecodeError", id="invalid-toml"
+    ),
+    pytest.param(None, None, None, None, id="no-ssm-path"),
+]
+
+
+@pytest.mark.parametrize("behavior,env,expect_key,raises", _READ_CONFIG_SSM_CASES)
+def test_read_config_ssm(
+    ssm_client, monkeypatch, config_model, behavior, env, expect_key, raises
+):
+    """Test read_config_ssm across the parameter, error, and no-path scenarios."""
+    if behavior is not None:
+        behavior(ssm_client)
+    if env is not None:
+        monkeypatch.setenv(CYHY_CONFIG_SSM_PATH_ENV, env)
+        _refresh_env()
+    if raises == "ClientError":
+        # Third-Party Libraries
+        from botocore.exceptions import ClientError
+
+        with pytest.raises(ClientError):
+            read_config_ssm()
+    elif raises == "TOMLDecodeError":
+        with pytest.raises(tomllib.TOMLDecodeError):
+            read_config_ssm()
+    elif expect_key is not None:
+        config = read_config_ssm(model=config_model)
+        assert config.key == expect_key
+    else:
+        assert read_config_ssm() is None
+
+
+def test_read_config_file_file_exists(monkeypatch, config_model):
+    """Test read_config_file when the file exists."""
+    monkeypatch.setattr(
+        "cyhy_config.cyhy_config._read_file_bytes",
+        lambda *args, **kwargs: b'key = "value"',
+    )
+    config = read_config_file(_MOCK_PATH, model=config_model)
+    assert config.key == "value"
 
-    with patch("cyhy_config.cyhy_config.client", return_value=mock_ssm_client):
-        with patch.dict(os.environ, {CYHY_CONFIG_SSM_PATH_ENV: "/mock/ssm/bad_path"}):
-            with pytest.raises(ClientError):
-                read_config_ssm()
 
+def test_read_config_file_file_not_found():
+    """Test read_config_file when the file does not exist."""
+    with pytest.raises(FileNotFoundError):
+        read_config_file(_MOCK_PATH)
 
-def test_read_config_ssm_invalid_toml():
-    """Test read_config_ssm when SSM returns bad TOML data."""
-    mock_ssm_client = MagicMock()
-    mock_ssm_client.get_parameter.return_value = {
-        "Parameter": {"Value": "This is not valid TOML"}
-    }
 
-    with patch("cyhy_config.cyhy_config.client", return_value=mock_ssm_client):
-        with patch.dict(os.environ, {CYHY_CONFIG_SSM_PATH_ENV: "/mock/ssm/path"}):
-            with pytest.raises(tomllib.TOMLDecodeError):
-                read_config_ssm()
+def test_read_config_file_is_directory(tmp_path):
+    """Test read_config_file when the path refers to a directory."""
+    with pytest.raises(FileNotFoundError):
+        read_config_file(tmp_path)
 
 
-def test_read_config_ssm_no_ssm_paths():
-    """Test read_config_ssm when no SSM paths are provided."""
-    assert read_config_ssm() is None
+def test_read_config_file_invalid_toml(monkeypatch):
+    """Test read_config_file when the TOML data is invalid."""
+    monkeypatch.setattr(
+        "cyhy_config.cyhy_config._read_file_bytes",
+        lambda *args, **kwargs: b"This is not valid TOML",
+    )
+    with pytest.raises(tomllib.TOMLDecodeError):
+        read_config_file(_MOCK_PATH)
+
+
+def test_read_config_file_cached(tmp_path, config_model):
+    """Test that read_config_file caches results for an unchanged file."""
+    config_file = tmp_path / "cyhy.toml"
+    config_file.write_text('key = "value"')
+    clear_caches()
+    first = read_config_file(config_file, model=config_model)
+    second = read_config_file(config_file, model=config_model)
+    assert second is first, "expected the cached configuration to be returned"
+
+
+def test_read_config_file_cache_invalidated_on_change(tmp_path, config_model):
+    """Test that read_config_file re-reads a file after it changes."""
+    config_file = tmp_path / "cyhy.toml"
+    config_file.write_text('key = "value"')
+    clear_caches()
+    first = read_config_file(config_file, model=config_model)
+    config_file.write_text('key = "other value"')
+    second = read_config_file(config_file, model=config_model)
+    assert first.key == "value"
+    assert second.key == "other value"
+
+
+def test_read_config_file_json_cache(tmp_path, monkeypatch, config_model):
+    """Test that a validated configuration is served from the JSON side-cache."""
+    config_file = tmp_path / "cyhy.toml"
+    config_file.write_text('key = "value"')
+    clear_caches()
+    first = read_config_file(config_file, model=config_model)
+    clear_caches()
+    # With the in-memory caches cleared, the JSON side-cache satisfies the
+    # load without re-parsing the TOML.
+    monkeypatch.setattr(
+        "cyhy_config.cyhy_config._toml_loads", MagicMock(side_effect=AssertionError)
+    )
+    second = read_config_file(config_file, model=config_model)
+    assert second == first
+    # The cached copy may hold secrets, so it must be owner-only.
+    digest_hex = hashlib.blake2b(config_file.read_bytes(), digest_size=16).hexdigest()
+    cache_file = _json_cache_path(digest_hex, config_model)
+    assert cache_file.stat().st_mode & 0o777 == 0o600
+    assert cache_file.parent.stat().st_mode & 0o777 == 0o700
+
+
+def test_read_config_file_json_cache_stale(tmp_path, config_model):
+    """Test that an unusable JSON side-cache entry is ignored."""
+    config_file = tmp_path / "cyhy.toml"
+    config_file.write_text('key = "value"')
+    clear_caches()
+    digest_hex = hashlib.blake2b(config_file.read_bytes(), digest_size=16).hexdigest()
+    cache_file = _json_cache_path(digest_hex, config_model)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    # An empty document does not validate against config_model.
+    cache_file.write_text("{}")
+    config = read_config_file(config_file, model=config_model)
+    assert config.key == "value"
 
 
-def test_read_config_file_file_exists():
-    """Test read_config_file when the file exists."""
-    mock_file_data = b'key = "value"'
-    with patch("os.path.isfile", return_value=True):
-        with patch("builtins.open", mock_open(read_data=mock_file_data)):
-            with patch(
-                "cyhy_config.cyhy_config.tomllib.load", return_value={"key": "value"}
-            ):
-                config = read_config_file(Path("/mock/path"), model=TestModel)
-                assert config.key == "value"
+def test_read_config_file_json_cache_unwritable(tmp_path, monkeypatch, config_model):
+    """Test that a failure to write the JSON side-cache is not fatal."""
+    blocker = tmp_path / "blocked-cache"
+    blocker.write_text("not a directory")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(blocker))
+    config_file = tmp_path / "cyhy.toml"
+    config_file.write_text('key = "value"')
+    clear_caches()
+    config = read_config_file(config_file, model=config_model)
+    assert config.key == "value"
 
 
-def test_read_config_file_file_not_found():
-    """Test read_config_file when the file does not exist."""
-    with patch("os.path.isfile", return_value=False):
-        with pytest.raises(FileNotFoundError):
-            read_config_file(Path("/mock/path"))
+def test_read_config_file_large_file(tmp_path, config_model):
+    """Test read_config_file on a file large enough to use the mmap path."""
+    config_file = tmp_path / "cyhy.toml"
+    # Pad the file past the mmap threshold with comment lines.
+    config_file.write_text('key = "value"\n' + ("# padding\n" * 30_000))
+    clear_caches()
+    config = read_config_file(config_file, model=config_model)
+    assert config.key == "value"
 
 
-def test_read_config_file_invalid_toml():
-    """Test read_config_file when the TOML data is invalid."""
-    mock_file_data = b'key = "value"'
-    with patch("os.path.isfile", return_value=True):
-        with patch("builtins.open", mock_open(read_data=mock_file_data)):
-            with patch(
-                "cyhy_config.cyhy_config.tomllib.load",
-                side_effect=tomllib.TOMLDecodeError("Error", "doc", 0),
-            ):
-                with pytest.raises(tomllib.TOMLDecodeError):
-                    read_config_file(Path("/mock/path"))
-
-
-def test_validate_config_valid_dict():
+def test_read_config_ssm_cached_by_version(ssm_client, monkeypatch, config_model):
+    """Test that read_config_ssm caches results by parameter version."""
+    ssm_client.get_parameter.return_value = _ssm_response('key = "value"', version=1)
+    monkeypatch.setenv(CYHY_CONFIG_SSM_PATH_ENV, "/mock/ssm/path")
+    _refresh_env()
+    clear_caches()
+    first = read_config_ssm(model=config_model)
+    second = read_config_ssm(model=config_model)
+    assert second is first, "expected the cached configuration to be returned"
+
+
+def test_validate_config_valid_dict(config_model):
     """Test validate_config with a valid config dictionary."""
     config_dict = {"key": "value"}
-    config = validate_config(config_dict, TestModel)
+    config = validate_config(config_dict, config_model)
     assert config.key == "value"
 
 
-def test_validate_config_empty_dict():
+def test_validate_config_empty_dict(config_model):
     """Test validate_config with an empty config dictionary."""
+    # Third-Party Libraries
+    from pydantic import ValidationError
+
     with pytest.raises(ValidationError):
-        validate_config({}, TestModel)
+        validate_config({}, config_model)
+
+
+def test_validate_config_digest_skips_validation(config_model):
+    """Test that a previously validated digest bypasses model validation."""
+    clear_caches()
+    digest = b"mock-digest"
+    first = validate_config({"key": "value"}, config_model, digest)
+    assert first.key == "value"
+    # The digest is now trusted, so the previously validated instance is
+    # returned without re-running validation (an empty dict would otherwise
+    # raise).
+    second = validate_config({}, config_model, digest)
+    assert second is first, "expected the previously validated instance"
+
+
+def test_validate_config_debug_logging_disabled(caplog, config_model):
+    """Test that configurations are not pretty-printed when debug logging is off."""
+    caplog.set_level(logging.INFO, logger="cyhy.cyhy_config.cyhy_config")
+    config = validate_config({"key": "value"}, config_model)
+    assert config.key == "value"
+    config_dict = validate_config({"key": "value"}, None)
+    assert config_dict == {"key": "value"}
 
 
 def test_validate_config_no_model():
@@ -206,26 +391,33 @@ def test_validate_config_no_model():
     config_dict = {"key": "value"}
     config = validate_config(config_dict, None)
     assert config == config_dict
+    # The returned mapping is a read-only view of the parsed configuration.
+    with pytest.raises(TypeError):
+        config["key"] = "other value"
 
 
-def test_get_config_from_ssm():
+def test_get_config_from_ssm(monkeypatch, config_model):
     """Test the get_config function when the config is retrieved from AWS SSM."""
-    with patch(
-        "cyhy_config.cyhy_config.read_config_ssm", return_value={"key": "value"}
-    ):
-        config = get_config(model=TestModel)
-        assert config["key"] == "value"
+    monkeypatch.setattr(
+        "cyhy_config.cyhy_config.read_config_ssm",
+        MagicMock(return_value={"key": "value"}),
+    )
+    config = get_config(model=config_model)
+    assert config["key"] == "value"
 
 
-def test_get_config_fallback_to_file():
+def test_get_config_fallback_to_file(monkeypatch, config_model):
     """Test get_config fallback from SSM to file."""
-    with patch("cyhy_config.cyhy_config.read_config_ssm", return_value=None):
-        with patch(
-            "cyhy_config.cyhy_config.find_config_file", return_value=Path("/mock/path")
-        ):
-            with patch(
-                "cyhy_config.cyhy_config.read_config_file",
-                return_value={"key": "value"},
-            ):
-                config = get_config(model=TestModel)
-                assert config["key"] == "value"
+    monkeypatch.setattr(
+        "cyhy_config.cyhy_config.read_config_ssm", MagicMock(return_value=None)
+    )
+    monkeypatch.setattr(
+        "cyhy_config.cyhy_config.find_config_file",
+        MagicMock(return_value=_MOCK_PATH),
+    )
+    monkeypatch.setattr(
+        "cyhy_config.cyhy_config.read_config_file",
+        MagicMock(return_value={"key": "value"}),
+    )
+    config = get_config(model=config_model)
+    assert config["key"] == "value"